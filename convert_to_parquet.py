@@ -0,0 +1,32 @@
+"""
+One-time conversion of the risk-scored transaction CSVs to Parquet.
+
+Run once after the notebooks regenerate the CSV outputs:
+
+    python convert_to_parquet.py
+
+The Streamlit app reads the Parquet files, which decode ~10x faster
+than CSV and let us load only the columns the app actually uses.
+"""
+
+import os
+
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+BASE_PATH = "OUTPUTS/RISK_SCORE_TXNS"
+MONTHS = ["2025_01", "2025_02", "2025_03"]
+
+for m in MONTHS:
+    csv_path = os.path.join(BASE_PATH, f"risk_scored_transactions_{m}.csv")
+    parquet_path = os.path.join(BASE_PATH, f"risk_scored_transactions_{m}.parquet")
+
+    table = pacsv.read_csv(csv_path)
+    pq.write_table(
+        table,
+        parquet_path,
+        compression="zstd",
+        use_dictionary=True,
+        row_group_size=1_000_000,
+    )
+    print(f"{csv_path} -> {parquet_path} ({table.num_rows:,} rows)")
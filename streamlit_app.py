@@ -2,11 +2,10 @@ import streamlit as st
 import pandas as pd
 import os
 import numpy as np
-
-# =====================================================
-# CRITICAL FIX: DISABLE PYARROW STRING STORAGE
-# =====================================================
-pd.options.mode.string_storage = "python"
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit, prange
 
 # =====================================================
 # PAGE CONFIG
@@ -22,25 +21,139 @@ st.set_page_config(
 BASE_PATH = "OUTPUTS/RISK_SCORE_TXNS"
 MONTHS = ["2025_01", "2025_02", "2025_03"]
 
-@st.cache_data
-def load_data():
-    dfs = []
-    for m in MONTHS:
-        path = os.path.join(BASE_PATH, f"risk_scored_transactions_{m}.csv")
-        df = pd.read_csv(path, parse_dates=["transaction_timestamp"])
-        df["month"] = m
-        dfs.append(df)
+# Only the columns the app actually reads — Parquet skips the rest entirely
+COLUMNS = [
+    "transaction_id",
+    "customer_id",
+    "destination_country",
+    "ml_risk_score",
+    "trust_score",
+    "decision",
+    "transaction_amount",
+    "reason_codes_str",
+]
+
+def _read_month(m):
+    path = os.path.join(BASE_PATH, f"risk_scored_transactions_{m}.parquet")
+    table = pq.read_table(path, columns=COLUMNS)
+    return table.append_column(
+        "month", pa.array([m] * table.num_rows).dictionary_encode()
+    )
 
-    df_all = pd.concat(dfs, ignore_index=True)
+@st.cache_data(persist="disk", show_spinner="Loading transactions…", max_entries=1)
+def load_data():
+    # Parquet decode releases the GIL, so the three month files read
+    # concurrently for a near-linear cold-start speedup
+    with ThreadPoolExecutor(max_workers=len(MONTHS)) as ex:
+        tables = list(ex.map(_read_month, MONTHS))
+
+    # concat_tables is zero-copy chunk stitching; self_destruct releases the
+    # Arrow buffers as columns are handed over, avoiding a doubled peak
+    df_all = pa.concat_tables(tables).to_pandas(
+        types_mapper=pd.ArrowDtype, self_destruct=True
+    )
 
-    # Force all string columns to pure Python strings
-    for col in df_all.select_dtypes(include=["object", "string"]).columns:
-        df_all[col] = df_all[col].astype(str)
+    # Low-cardinality columns (3 decisions, 3 months, tens of countries):
+    # categoricals make groupby/isin/value_counts hash int8 codes, not strings
+    for col in ["decision", "month", "destination_country"]:
+        df_all[col] = df_all[col].astype("category")
+
+    # Downcast the hot numeric columns — risk scores fit float32 and trust
+    # scores fit int8, halving (or better) the bytes per comparison in the
+    # simulator's vectorized passes
+    assert df_all["trust_score"].between(0, 100).all()
+    df_all = df_all.astype({
+        "ml_risk_score": "float32",
+        "trust_score": "int8",
+        "transaction_amount": "float32",
+    })
 
     return df_all
 
 df = load_data()
 
+# =====================================================
+# DECISION SIMULATOR KERNEL
+# =====================================================
+# Decision codes: 0 = ALLOW, 1 = REVIEW, 2 = BLOCK
+DECISION_LABELS = ["ALLOW", "REVIEW", "BLOCK"]
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _decide(risk, trust, block_threshold, review_threshold, trust_override, out):
+    for i in prange(risk.size):
+        if trust[i] >= trust_override and risk[i] < block_threshold:
+            out[i] = 0
+        elif risk[i] >= block_threshold:
+            out[i] = 2
+        elif risk[i] >= review_threshold:
+            out[i] = 1
+        else:
+            out[i] = 0
+
+# Simulator inputs extracted once — slider reruns touch only these arrays,
+# never the DataFrame
+R_ARR = df["ml_risk_score"].to_numpy()
+T_ARR = df["trust_score"].to_numpy()
+
+# =====================================================
+# CACHED AGGREGATES
+# =====================================================
+# df is static for the session, so these are computed once per process
+# instead of on every tab switch / rerun
+
+@st.cache_data
+def _orig_dist():
+    return df["decision"].value_counts(normalize=True).mul(100)
+
+ORIG_DIST = _orig_dist()
+
+@st.cache_data
+def decision_month_pivot():
+    counts = (
+        df.groupby(["month", "decision"], observed=True, sort=False)
+        .size()
+        .unstack("decision", fill_value=0)
+    )
+    return counts.div(counts.sum(axis=1), axis=0).mul(100)
+
+# Bin edges and labels are fixed — format the 20 labels once at import
+_BINS = np.linspace(0, 1, 21)
+_LABELS = [f"{_BINS[i]:.2f}-{_BINS[i+1]:.2f}" for i in range(20)]
+
+@st.cache_data
+def risk_band_df():
+    hist, _ = np.histogram(df["ml_risk_score"].to_numpy(), bins=_BINS)
+    return pd.DataFrame({
+        "Risk Band": _LABELS,
+        "Transactions": hist
+    }).set_index("Risk Band")
+
+@st.cache_data
+def corridor_risk():
+    return (
+        df.groupby("destination_country", observed=True)["ml_risk_score"]
+        .mean()
+        .nlargest(5)
+        .reset_index()
+    )
+
+@st.cache_data
+def category_index(col):
+    # Row indices per category value — turns an O(N) isin scan into an
+    # O(selected) lookup in the Transaction Explorer
+    codes = df[col].cat.codes.to_numpy()
+    return {
+        cat: np.flatnonzero(codes == i).astype(np.int32)
+        for i, cat in enumerate(df[col].cat.categories)
+    }
+
+MONTH_IDX = category_index("month")
+DECISION_IDX = category_index("decision")
+
+# Categoricals already know their (sorted) distinct values — no O(N) unique
+MONTHS_LIST = df["month"].cat.categories.tolist()
+DECISIONS_LIST = df["decision"].cat.categories.tolist()
+
 # =====================================================
 # TITLE
 # =====================================================
@@ -76,20 +189,7 @@ with tab1:
     c3.metric("Months Covered", df["month"].nunique())
     c4.metric("Destination Countries", df["destination_country"].nunique())
 
-    decision_month = (
-        df.groupby(["month", "decision"])
-        .size()
-        .reset_index(name="count")
-    )
-
-    decision_month["total"] = decision_month.groupby("month")["count"].transform("sum")
-    decision_month["percentage"] = decision_month["count"] / decision_month["total"] * 100
-
-    pivot = decision_month.pivot(
-        index="month",
-        columns="decision",
-        values="percentage"
-    ).fillna(0)
+    pivot = decision_month_pivot()
 
     st.markdown("### Monthly Decision Split (%)")
     st.bar_chart(pivot)
@@ -104,30 +204,20 @@ with tab2:
     review_threshold = st.slider("Review if ML risk ≥", 0.1, 0.9, 0.6, 0.05)
     trust_override = st.slider("Auto-allow if Trust score ≥", 0, 100, 70, 5)
 
-    sim_df = df.copy()
-
-    def simulate(row):
-        if row["ml_risk_score"] >= block_threshold:
-            d = "BLOCK"
-        elif row["ml_risk_score"] >= review_threshold:
-            d = "REVIEW"
-        else:
-            d = "ALLOW"
-
-        if row["trust_score"] >= trust_override and row["ml_risk_score"] < block_threshold:
-            d = "ALLOW"
+    # Output buffer allocated once per session — reused on every slider move
+    if "sim_out" not in st.session_state:
+        st.session_state["sim_out"] = np.empty(len(df), dtype=np.int8)
+    sim_out = st.session_state["sim_out"]
 
-        return d
+    _decide(R_ARR, T_ARR, block_threshold, review_threshold, trust_override, sim_out)
 
-    sim_df["simulated_decision"] = sim_df.apply(simulate, axis=1)
-
-    sim_dist = sim_df["simulated_decision"].value_counts(normalize=True) * 100
-    orig_dist = df["decision"].value_counts(normalize=True) * 100
+    counts = np.bincount(sim_out, minlength=3)
+    sim_dist = pd.Series(counts / counts.sum() * 100, index=DECISION_LABELS)
 
     c1, c2, c3 = st.columns(3)
-    c1.metric("ALLOW %", f"{sim_dist.get('ALLOW',0):.2f}", f"{sim_dist.get('ALLOW',0)-orig_dist.get('ALLOW',0):+.2f}")
-    c2.metric("REVIEW %", f"{sim_dist.get('REVIEW',0):.2f}", f"{sim_dist.get('REVIEW',0)-orig_dist.get('REVIEW',0):+.2f}")
-    c3.metric("BLOCK %", f"{sim_dist.get('BLOCK',0):.2f}", f"{sim_dist.get('BLOCK',0)-orig_dist.get('BLOCK',0):+.2f}")
+    c1.metric("ALLOW %", f"{sim_dist.get('ALLOW',0):.2f}", f"{sim_dist.get('ALLOW',0)-ORIG_DIST.get('ALLOW',0):+.2f}")
+    c2.metric("REVIEW %", f"{sim_dist.get('REVIEW',0):.2f}", f"{sim_dist.get('REVIEW',0)-ORIG_DIST.get('REVIEW',0):+.2f}")
+    c3.metric("BLOCK %", f"{sim_dist.get('BLOCK',0):.2f}", f"{sim_dist.get('BLOCK',0)-ORIG_DIST.get('BLOCK',0):+.2f}")
 
 # =====================================================
 # TAB 3 — RISK ANALYSIS
@@ -135,26 +225,10 @@ with tab2:
 with tab3:
     st.subheader("Risk Analysis")
 
-    bins = np.linspace(0, 1, 21)
-    hist, edges = np.histogram(df["ml_risk_score"], bins=bins)
-
-    risk_df = pd.DataFrame({
-        "Risk Band": [f"{edges[i]:.2f}-{edges[i+1]:.2f}" for i in range(len(hist))],
-        "Transactions": hist
-    })
-
-    st.bar_chart(risk_df.set_index("Risk Band"))
-
-    corridor = (
-        df.groupby("destination_country")["ml_risk_score"]
-        .mean()
-        .sort_values(ascending=False)
-        .head(5)
-        .reset_index()
-    )
+    st.bar_chart(risk_band_df())
 
     st.markdown("### Highest Risk Destination Corridors")
-    st.dataframe(corridor, use_container_width=True)
+    st.dataframe(corridor_risk(), use_container_width=True)
 
 # =====================================================
 # TAB 4 — TRANSACTION EXPLORER
@@ -162,21 +236,34 @@ with tab3:
 with tab4:
     st.subheader("Transaction Explorer")
 
-    months = sorted(df["month"].unique().tolist())
-    decisions = sorted(df["decision"].unique().tolist())
-
-    m_filter = st.multiselect("Month", months, months)
-    d_filter = st.multiselect("Decision", decisions, decisions)
+    m_filter = st.multiselect("Month", MONTHS_LIST, MONTHS_LIST)
+    d_filter = st.multiselect("Decision", DECISIONS_LIST, DECISIONS_LIST)
     min_risk = st.slider("Minimum ML risk score", 0.0, 1.0, 0.0, 0.05)
 
-    view = df[
-        (df["month"].isin(m_filter)) &
-        (df["decision"].isin(d_filter)) &
-        (df["ml_risk_score"] >= min_risk)
-    ]
-
+    # Intersect precomputed index arrays instead of scanning the columns
+    if m_filter and d_filter:
+        idx = np.intersect1d(
+            np.concatenate([MONTH_IDX[m] for m in m_filter]),
+            np.concatenate([DECISION_IDX[d] for d in d_filter]),
+        )
+    else:
+        idx = np.empty(0, dtype=np.int32)
+
+    if min_risk > 0:
+        idx = idx[R_ARR[idx] >= min_risk]
+
+    # Partial sort: pick the 500 highest-risk rows in O(N), sort only those
+    risk = R_ARR[idx]
+    if risk.size > 500:
+        part = np.argpartition(-risk, 500)[:500]
+        order = part[np.argsort(-risk[part])]
+    else:
+        order = np.argsort(-risk)
+
+    # Only the displayed rows are materialized; their Arrow-backed string
+    # columns hand off to st.dataframe's serializer without a copy
     st.dataframe(
-        view[
+        df.take(idx[order])[
             [
                 "transaction_id",
                 "month",
@@ -184,10 +271,8 @@ with tab4:
                 "ml_risk_score",
                 "trust_score",
                 "decision",
-                "reason_codes_str"
+                "reason_codes_str",
             ]
-        ]
-        .sort_values("ml_risk_score", ascending=False)
-        .head(500),
+        ],
         use_container_width=True
     )